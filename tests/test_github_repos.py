@@ -0,0 +1,539 @@
+"""Tests for python_utilities.github_repos."""
+
+import errno
+import json
+import subprocess
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from python_utilities.github_repos import GitHubRepoManager, Logger, _link_last_page
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(
+        ["git", *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _make_remote(path: Path, content: str = "hello\n") -> str:
+    """Create a bare repository with one commit and return its clone URL."""
+    work = path.parent / f"{path.stem}-work"
+    _git("init", "-q", "--bare", str(path))
+    _git("init", "-q", str(work))
+    (work / "README.md").write_text(content)
+    _git("-C", str(work), "add", ".")
+    _git(
+        "-C",
+        str(work),
+        "-c",
+        "user.name=test",
+        "-c",
+        "user.email=test@example.com",
+        "commit",
+        "-qm",
+        "initial",
+    )
+    _git("-C", str(work), "push", "-q", str(path), "HEAD:refs/heads/main")
+    _git("--git-dir", str(path), "symbolic-ref", "HEAD", "refs/heads/main")
+    return path.as_uri()
+
+
+def _push(path: Path, content: str, branch: str = "main") -> None:
+    """Commit new README content to a remote made by _make_remote."""
+    work = str(path.parent / f"{path.stem}-work")
+    Path(work, "README.md").write_text(content)
+    _git(
+        "-C",
+        work,
+        "-c",
+        "user.name=test",
+        "-c",
+        "user.email=test@example.com",
+        "commit",
+        "-qam",
+        content,
+    )
+    _git("-C", work, "push", "-q", str(path), f"HEAD:refs/heads/{branch}")
+
+
+class _ListedRepoManager(GitHubRepoManager):
+    """GitHubRepoManager whose listing is a fixed list instead of the API."""
+
+    def __init__(self, repos: list[dict[str, Any]], **kwargs: Any) -> None:
+        super().__init__("user", token="token", **kwargs)
+        self._repos = repos
+
+    def iter_repos(self) -> Iterator[dict[str, Any]]:
+        yield from self._repos
+
+
+def _sync(tmp_path: Path, repos: list[dict[str, Any]], **kwargs: Any) -> dict[str, int]:
+    """Sync the listing into tmp_path/repos and return the logged stats."""
+    with _ListedRepoManager(
+        repos,
+        base_path=str(tmp_path / "repos"),
+        log_file=str(tmp_path / "sync.log"),
+        **kwargs,
+    ) as manager:
+        manager.sync_all_repos()
+        return dict(manager.logger.stats)
+
+
+def test_syncs_public_and_private_repos_with_the_same_name(tmp_path: Path) -> None:
+    public = {
+        "name": "foo",
+        "private": False,
+        "clone_url": _make_remote(tmp_path / "user" / "foo.git"),
+    }
+    private = {
+        "name": "foo",
+        "private": True,
+        "clone_url": _make_remote(tmp_path / "org" / "foo.git"),
+    }
+    base_path = tmp_path / "repos"
+
+    stats = _sync(tmp_path, [public, private])
+    assert stats["cloned"] == 2
+    assert stats["errors"] == 0
+    assert (base_path / "public" / "foo" / "README.md").is_file()
+    assert (base_path / "private" / "foo" / "README.md").is_file()
+
+    # Neither copy is mistaken for the other having changed visibility
+    stats = _sync(tmp_path, [public, private])
+    assert stats["moved"] == 0
+    assert stats["errors"] == 0
+
+    # Only the copy in the folder of the removed repository is deleted
+    stats = _sync(tmp_path, [private])
+    assert stats["deleted"] == 1
+    assert stats["errors"] == 0
+    assert not (base_path / "public" / "foo").exists()
+    assert (base_path / "private" / "foo" / "README.md").is_file()
+
+
+def test_new_repo_is_not_mistaken_for_a_visibility_change(tmp_path: Path) -> None:
+    private = {
+        "name": "foo",
+        "private": True,
+        "clone_url": _make_remote(tmp_path / "org" / "foo.git"),
+    }
+    public = {
+        "name": "foo",
+        "private": False,
+        "clone_url": _make_remote(tmp_path / "user" / "foo.git"),
+    }
+    _sync(tmp_path, [private])
+
+    stats = _sync(tmp_path, [public, private])
+    assert stats["cloned"] == 1
+    assert stats["moved"] == 0
+    assert stats["errors"] == 0
+
+
+def test_moves_repo_whose_visibility_changed(tmp_path: Path) -> None:
+    repo = {
+        "name": "foo",
+        "private": False,
+        "clone_url": _make_remote(tmp_path / "remote.git"),
+    }
+    base_path = tmp_path / "repos"
+    _sync(tmp_path, [repo])
+
+    stats = _sync(tmp_path, [{**repo, "private": True}])
+    assert stats["moved"] == 1
+    assert stats["cloned"] == 0
+    assert stats["deleted"] == 0
+    assert stats["errors"] == 0
+    assert not (base_path / "public" / "foo").exists()
+    assert (base_path / "private" / "foo" / "README.md").is_file()
+
+
+def test_skips_repo_whose_pushed_at_is_unchanged(tmp_path: Path) -> None:
+    remote = tmp_path / "remote.git"
+    repo = {
+        "name": "foo",
+        "private": False,
+        "clone_url": _make_remote(remote),
+        "pushed_at": "2026-10-01T00:00:00Z",
+    }
+    readme = tmp_path / "repos" / "public" / "foo" / "README.md"
+    _sync(tmp_path, [repo])
+
+    # Nothing is fetched while the listing still shows the recorded pushed_at
+    _push(remote, "second\n")
+    stats = _sync(tmp_path, [repo])
+    assert stats["skipped"] == 1
+    assert stats["errors"] == 0
+    assert readme.read_text() == "hello\n"
+
+    stats = _sync(tmp_path, [{**repo, "pushed_at": "2026-10-02T00:00:00Z"}])
+    assert stats["updated"] == 1
+    assert stats["errors"] == 0
+    assert readme.read_text() == "second\n"
+
+
+def test_head_oid_decides_whether_a_pushed_repo_changed(tmp_path: Path) -> None:
+    remote = tmp_path / "remote.git"
+    offline = tmp_path / "offline.git"
+    repo = {
+        "name": "foo",
+        "private": False,
+        "clone_url": _make_remote(remote),
+        "pushed_at": "2026-10-01T00:00:00Z",
+        "head_oid": _git("--git-dir", str(remote), "rev-parse", "main").strip(),
+    }
+    readme = tmp_path / "repos" / "public" / "foo" / "README.md"
+    _sync(tmp_path, [repo])
+
+    # A head equal to the recorded one needs no network access at all
+    remote.rename(offline)
+    stats = _sync(tmp_path, [{**repo, "pushed_at": "2026-10-02T00:00:00Z"}])
+    assert stats["unchanged"] == 1
+    assert stats["errors"] == 0
+    offline.rename(remote)
+
+    # A push to another branch leaves the default branch head where it was
+    _push(remote, "feature\n", branch="feature")
+    stats = _sync(tmp_path, [{**repo, "pushed_at": "2026-10-03T00:00:00Z"}])
+    assert stats["unchanged"] == 1
+    assert stats["errors"] == 0
+    assert readme.read_text() == "hello\n"
+
+    _push(remote, "second\n")
+    pushed = {
+        **repo,
+        "pushed_at": "2026-10-04T00:00:00Z",
+        "head_oid": _git("--git-dir", str(remote), "rev-parse", "main").strip(),
+    }
+    stats = _sync(tmp_path, [pushed])
+    assert stats["updated"] == 1
+    assert stats["errors"] == 0
+    assert readme.read_text() == "second\n"
+
+
+def test_updates_do_not_wait_for_clone_slots(tmp_path: Path) -> None:
+    clone_url = _make_remote(tmp_path / "remote.git")
+    base_path = tmp_path / "repos"
+    (base_path / "public" / "existing").mkdir(parents=True)
+    updated = tmp_path / "updated"
+    repos = [
+        {"name": "new", "private": False, "clone_url": clone_url},
+        {"name": "existing", "private": False, "clone_url": clone_url},
+    ]
+
+    class Manager(_ListedRepoManager):
+        def _build_command(
+            self, repo: dict[str, Any], repo_dir: str, partial: bool
+        ) -> list[str]:
+            # The only clone slot stays busy until the update has started
+            command = " ".join(super()._build_command(repo, repo_dir, partial))
+            return [
+                "sh",
+                "-c",
+                f"for i in $(seq 100); do [ -e {updated} ] && exec {command}; "
+                "sleep 0.1; done; exit 1",
+            ]
+
+        def _process_repo(
+            self, repo: dict[str, Any], visibility: str | None = None
+        ) -> None:
+            updated.touch()
+
+    with Manager(
+        repos, base_path=str(base_path), log_file=str(tmp_path / "sync.log"), jobs=1
+    ) as manager:
+        manager.sync_all_repos()
+
+        assert manager.logger.stats["cloned"] == 1
+        assert manager.logger.stats["errors"] == 0
+
+
+def test_object_store_keeps_same_named_repos_apart(tmp_path: Path) -> None:
+    repos = [
+        {
+            "name": "foo",
+            "private": private,
+            "clone_url": _make_remote(tmp_path / owner / "foo.git", owner),
+        }
+        for owner, private in (("user", False), ("org", True))
+    ]
+    base_path = tmp_path / "repos"
+    stats = _sync(tmp_path, repos, shared_objects=True)
+    assert stats["cloned"] == 2
+    assert stats["errors"] == 0
+
+    # Objects borrowed by either clone must survive a gc of the store
+    _git("--git-dir", str(base_path / ".objects.git"), "gc", "-q", "--prune=now")
+    for visibility in ("public", "private"):
+        _git("-C", str(base_path / visibility / "foo"), "fsck", "--full")
+
+    # Deleting one repository keeps the objects the other still borrows
+    _sync(tmp_path, repos[1:], shared_objects=True)
+    _git("--git-dir", str(base_path / ".objects.git"), "gc", "-q", "--prune=now")
+    _git("-C", str(base_path / "private" / "foo"), "fsck", "--full")
+
+
+def test_dead_submodule_does_not_fail_the_clone(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Recent git refuses file:// submodules unless told otherwise
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+    monkeypatch.setenv("GIT_CONFIG_KEY_0", "protocol.file.allow")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_0", "always")
+    sub_url = _make_remote(tmp_path / "sub.git")
+    dead_path = tmp_path / "dead.git"
+    clone_url = _make_remote(tmp_path / "super.git")
+    work = str(tmp_path / "super-work")
+    # "a-dead" sorts first, so it is attempted before the reachable submodule
+    for path in ("a-dead", "b-good"):
+        _git("-C", work, "submodule", "add", "-q", sub_url, path)
+    _git(
+        "-C",
+        work,
+        "config",
+        "-f",
+        ".gitmodules",
+        "submodule.a-dead.url",
+        dead_path.as_uri(),
+    )
+    _git(
+        "-C",
+        work,
+        "-c",
+        "user.name=test",
+        "-c",
+        "user.email=test@example.com",
+        "commit",
+        "-qam",
+        "submodules",
+    )
+    _git("-C", work, "push", "-q", str(tmp_path / "super.git"), "HEAD:main")
+    repos = [{"name": "super", "private": False, "clone_url": clone_url}]
+    repo_dir = tmp_path / "repos" / "public" / "super"
+
+    stats = _sync(tmp_path, repos)
+    assert stats["cloned"] == 1
+    assert stats["errors"] == 0
+    assert (repo_dir / "b-good" / "README.md").is_file()
+    assert not (repo_dir / "a-dead" / "README.md").exists()
+
+    # The missing submodule is retried even though nothing was pushed
+    _git("clone", "-q", "--bare", sub_url, str(dead_path))
+    stats = _sync(tmp_path, repos)
+    assert stats["unchanged"] == 1
+    assert stats["errors"] == 0
+    assert (repo_dir / "a-dead" / "README.md").is_file()
+
+
+class _FakeResponse:
+    """The parts of requests.Response read by the REST listing."""
+
+    def __init__(
+        self,
+        status_code: int,
+        body: Any = None,
+        headers: dict[str, str] | None = None,
+        links: dict[str, dict[str, str]] | None = None,
+    ) -> None:
+        self.status_code = status_code
+        self.content = b"" if body is None else json.dumps(body).encode()
+        self.headers = headers or {}
+        self.links = links or {}
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class _FakeRestListing:
+    """
+    Stand-in for GET /user/repos, answering conditional requests like GitHub.
+
+    ETags are scoped to the token, so they change with it; Last-Modified
+    dates are not. Like GitHub, 304 responses carry no Link header.
+    """
+
+    last_modified = "Thu, 01 Oct 2026 00:00:00 GMT"
+
+    def __init__(self, repos: list[dict[str, Any]], token: str) -> None:
+        self.repos = repos
+        self.token = token
+        self.requests: list[tuple[int, dict[str, str]]] = []
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def get(
+        self, url: str, params: dict[str, int], headers: dict[str, str], timeout: int
+    ) -> _FakeResponse:
+        page, per_page = params["page"], params["per_page"]
+        with self._lock:
+            self.requests.append((page, dict(headers)))
+        etag = f'"{self.token}-{page}"'
+        response_headers = {"ETag": etag, "Last-Modified": self.last_modified}
+        if "If-None-Match" in headers:
+            not_modified = headers["If-None-Match"] == etag
+        else:
+            not_modified = headers.get("If-Modified-Since") == self.last_modified
+        if not_modified:
+            with self._lock:
+                self.not_modified += 1
+            return _FakeResponse(304, headers=response_headers)
+        last_page = max(1, -(-len(self.repos) // per_page))
+        links = {}
+        if page < last_page:
+            links["last"] = {"url": f"{url}?page={last_page}&per_page={per_page}"}
+        start = (page - 1) * per_page
+        return _FakeResponse(
+            200, self.repos[start : start + per_page], response_headers, links
+        )
+
+
+class _RestListingManager(GitHubRepoManager):
+    """
+    GitHubRepoManager listing through a _FakeRestListing, with every listed
+    repository already present locally and updates recorded instead of run.
+    """
+
+    def __init__(
+        self, listing: _FakeRestListing, base_path: Path, **kwargs: Any
+    ) -> None:
+        super().__init__(
+            "user",
+            token=listing.token,
+            base_path=str(base_path),
+            log_file=str(base_path.parent / "sync.log"),
+            api="rest",
+            **kwargs,
+        )
+        self.session.get = listing.get  # type: ignore[method-assign]
+        self.processed: list[str] = []
+        for repo in listing.repos:
+            (base_path / "public" / repo["name"]).mkdir(parents=True, exist_ok=True)
+
+    def _process_repo(
+        self, repo: dict[str, Any], visibility: str | None = None
+    ) -> None:
+        self.processed.append(repo["name"])
+
+
+def _rest_repos(count: int) -> list[dict[str, Any]]:
+    """Build a REST listing of count public repositories."""
+    return [
+        {"name": f"repo{i:03}", "private": False, "clone_url": "unused"}
+        for i in range(count)
+    ]
+
+
+def test_token_change_keeps_if_modified_since(tmp_path: Path) -> None:
+    base_path = tmp_path / "repos"
+    listing = _FakeRestListing(_rest_repos(3), token="old")
+    with _RestListingManager(listing, base_path) as manager:
+        manager.sync_all_repos()
+
+    # The stored ETag belongs to the old token, but the date still matches
+    listing = _FakeRestListing(_rest_repos(3), token="new")
+    with _RestListingManager(listing, base_path) as manager:
+        manager.sync_all_repos()
+        assert manager.processed == ["repo000", "repo001", "repo002"]
+    [(_, headers)] = listing.requests
+    assert "If-None-Match" not in headers
+    assert headers["If-Modified-Since"] == listing.last_modified
+
+    # The ETags were stored under the new token, so they are sent again
+    listing = _FakeRestListing(_rest_repos(3), token="new")
+    with _RestListingManager(listing, base_path) as manager:
+        manager.sync_all_repos()
+    [(_, headers)] = listing.requests
+    assert headers["If-None-Match"] == '"new-1"'
+
+
+def test_link_last_page() -> None:
+    url = "https://api.github.com/user/repos"
+    assert _link_last_page({"last": {"url": f"{url}?per_page=100&page=3"}}) == 3
+    assert _link_last_page({"next": {"url": f"{url}?page=2"}}) is None
+    assert _link_last_page({"last": {"url": url}}) is None
+    assert _link_last_page({}) is None
+
+
+def test_rest_listing_pages_come_back_not_modified(tmp_path: Path) -> None:
+    base_path = tmp_path / "repos"
+    repos = _rest_repos(250)
+    names = [repo["name"] for repo in repos]
+    listing = _FakeRestListing(repos, token="token")
+    with _RestListingManager(listing, base_path) as manager:
+        manager.sync_all_repos()
+        assert manager.processed == names
+    assert sorted(page for page, _ in listing.requests) == [1, 2, 3]
+
+    # Every page is a 304 without a Link header, so the number of pages comes
+    # from the cache entries
+    listing = _FakeRestListing(repos, token="token")
+    with _RestListingManager(listing, base_path) as manager:
+        manager.sync_all_repos()
+        assert manager.processed == names
+        assert manager.logger.stats["deleted"] == 0
+        last_pages = [entry["last_page"] for entry in manager._etag_cache.values()]
+    assert sorted(page for page, _ in listing.requests) == [1, 2, 3]
+    assert listing.not_modified == 3
+    assert last_pages == [3, 3, 3]
+
+
+class _FullDisk:
+    """File stand-in whose writes fail as if the disk were full."""
+
+    def write(self, data: bytes) -> int:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def test_log_write_errors_are_raised_by_flush(tmp_path: Path) -> None:
+    logger = Logger(str(tmp_path / "sync.log"))
+    logger._fh.close()
+    logger._fh = _FullDisk()
+
+    logger.log("detail", "first")
+    with pytest.raises(OSError, match="No space left"):
+        logger.flush()
+
+    # The writer thread survives the error and keeps draining the queue
+    logger.log("detail", "second")
+    with pytest.raises(OSError, match="No space left"):
+        logger.close()
+
+
+def test_failed_listing_drops_queued_updates(tmp_path: Path) -> None:
+    base_path = tmp_path / "repos"
+    names = ["a", "b", "c"]
+    for name in names:
+        (base_path / "public" / name).mkdir(parents=True)
+    processed = []
+
+    class Manager(_ListedRepoManager):
+        def iter_repos(self) -> Iterator[dict[str, Any]]:
+            yield from self._repos
+            raise RuntimeError("GitHub API error")
+
+        def _process_repo(
+            self, repo: dict[str, Any], visibility: str | None = None
+        ) -> None:
+            processed.append(repo["name"])
+            time.sleep(0.5)
+
+    repos = [{"name": name, "private": False, "clone_url": "unused"} for name in names]
+    with Manager(
+        repos, base_path=str(base_path), log_file=str(tmp_path / "sync.log"), jobs=1
+    ) as manager:
+        with pytest.raises(RuntimeError, match="GitHub API error"):
+            manager.sync_all_repos()
+
+    # Only the update already running when the listing failed was finished
+    assert processed == ["a"]